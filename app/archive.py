@@ -0,0 +1,82 @@
+from django.db import transaction
+
+from .models import Task, TaskDependency, ArchivedTask, ArchivedTaskDependency
+
+
+ARCHIVED_TASK_FIELDS = (
+    'id', 'project_id', 'title', 'description', 'duration_days', 'is_private', 'created_by_id',
+    'assigned_to_id', 'parent_task_id', 'is_completed', 'completion_date', 'version',
+)
+ARCHIVED_DEPENDENCY_FIELDS = ('id', 'task_id', 'depends_on_task_id', 'dependency_type', 'logical_condition')
+
+
+def completed_tree_ids(root_ids):
+    """
+    Expand main task ids into the ids of their whole subtask trees, one query
+    per tree level. Trees with any incomplete subtask are left out entirely,
+    as are trees a task outside them still depends on: deleting the tree would
+    cascade into that live dependency and could flip an OR condition to unmet.
+    """
+    root_of = {root_id: root_id for root_id in root_ids}
+    blocked_roots = set()
+    frontier = list(root_ids)
+    while frontier:
+        children = Task.objects.filter(parent_task_id__in=frontier).values_list('id', 'parent_task_id', 'is_completed')
+        frontier = []
+        for task_id, parent_id, is_completed in children:
+            root_of[task_id] = root_of[parent_id]
+            if not is_completed:
+                blocked_roots.add(root_of[parent_id])
+            frontier.append(task_id)
+
+    inbound = list(TaskDependency.objects.filter(depends_on_task_id__in=root_of.keys()).values_list('task_id', 'depends_on_task_id'))
+    while True: # Blocking one tree can strand dependencies into another, so repeat until stable
+        archivable = {task_id for task_id, root_id in root_of.items() if root_id not in blocked_roots}
+        newly_blocked = {
+            root_of[depends_on_task_id] for task_id, depends_on_task_id in inbound
+            if task_id not in archivable and root_of[depends_on_task_id] not in blocked_roots
+        }
+        if not newly_blocked:
+            return sorted(archivable)
+        blocked_roots |= newly_blocked
+
+
+def archivable_roots(completed_before):
+    """Main tasks completed before `completed_before`."""
+    return Task.objects.filter(parent_task__isnull=True, is_completed=True, completion_date__lt=completed_before)
+
+
+def archive_batch(root_ids, completed_before):
+    """
+    Move the completed trees under `root_ids`, plus the dependencies owned by
+    their tasks, into the archive tables in a single transaction. Roots are
+    re-checked inside it, since they may have been reopened since they were listed.
+    Returns (tasks archived, dependencies archived).
+    """
+    with transaction.atomic():
+        root_ids = list(archivable_roots(completed_before).filter(id__in=root_ids).values_list('id', flat=True))
+        task_ids = completed_tree_ids(root_ids)
+        if not task_ids:
+            return 0, 0
+
+        tasks = Task.objects.filter(id__in=task_ids)
+        dependencies = TaskDependency.objects.filter(task_id__in=task_ids) # No live task depends on the tree, see completed_tree_ids()
+
+        ArchivedTask.objects.bulk_create([ArchivedTask(**row) for row in tasks.values(*ARCHIVED_TASK_FIELDS)])
+        ArchivedTaskDependency.objects.bulk_create([ArchivedTaskDependency(**row) for row in dependencies.values(*ARCHIVED_DEPENDENCY_FIELDS)])
+
+        # Dependencies first so the task delete does not have to cascade into them
+        dependencies_archived, _ = dependencies.delete()
+        tasks.delete()
+        return len(task_ids), dependencies_archived
+
+
+def archive_completed_tasks(completed_before, batch_size=200):
+    """
+    Archive every completed task tree whose main task was completed before
+    `completed_before`, `batch_size` trees per transaction. Yields per-batch
+    (tasks archived, dependencies archived) so callers can report progress.
+    """
+    root_ids = list(archivable_roots(completed_before).order_by('id').values_list('id', flat=True))
+    for start in range(0, len(root_ids), batch_size):
+        yield archive_batch(root_ids[start:start + batch_size], completed_before)
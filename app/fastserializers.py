@@ -0,0 +1,99 @@
+"""
+Precompiled row extractors for the large list endpoints.
+
+Serializing thousands of tasks through DRF means a field-object call per field per
+row plus a model instance per row. For read-only list payloads we instead fetch
+`.values_list()` tuples and turn each into a dict through per-field getters over
+precomputed column indexes, producing exactly what the matching DRF serializer
+would. Field lists are taken from the serializers' Meta, and tests compare the
+two outputs. Dates and datetimes still go through the serializer field, which
+applies the current timezone and DATE_FORMAT/DATETIME_FORMAT.
+"""
+from operator import itemgetter
+
+from rest_framework import serializers as drf_serializers
+
+from .serializers import UserSerializer, TaskSerializer, TaskListSerializer, ProjectSerializer
+
+
+DERIVED_FIELDS = {
+    # Model properties exposed by serializers: output name -> (source column, function of that column's value)
+    'is_main_task': ('parent_task', lambda parent_task_id: parent_task_id is None),
+}
+
+
+def nested_user_getter(first, user_fields):
+    """Build the nested UserSerializer dict from consecutive joined columns, or None if unassigned."""
+    get_values = itemgetter(*range(first, first + len(user_fields)))
+
+    def get(row):
+        if row[first] is None:
+            return None
+        return dict(zip(user_fields, get_values(row)))
+    return get
+
+
+def derived_getter(index, derive):
+    def get(row):
+        return derive(row[index])
+    return get
+
+
+def representation_getter(index, field):
+    """Run the column's value through the serializer `field`, passing None through as DRF does."""
+    to_representation = field.to_representation
+
+    def get(row):
+        value = row[index]
+        return None if value is None else to_representation(value)
+    return get
+
+
+class RowExtractor:
+    """
+    Compiles a serializer's read representation into a `values_list()` column
+    list plus one getter per output field, each working on precomputed column
+    indexes. Nested UserSerializer fields become joined `<fk>__<field>` columns.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.columns = []
+        self.getters = []
+        declared = serializer_class._declared_fields
+        fields = serializer_class().fields
+        for name in serializer_class.Meta.fields:
+            field = declared.get(name)
+            if isinstance(field, UserSerializer):
+                first = len(self.columns)
+                self.columns.extend(f'{name}__{user_field}' for user_field in UserSerializer.Meta.fields)
+                getter = nested_user_getter(first, UserSerializer.Meta.fields)
+            elif name in DERIVED_FIELDS:
+                column, derive = DERIVED_FIELDS[name]
+                getter = derived_getter(self._column(column), derive)
+            elif isinstance(fields[name], (drf_serializers.DateTimeField, drf_serializers.DateField)):
+                getter = representation_getter(self._column(name), fields[name])
+            elif field is None or isinstance(field, (drf_serializers.PrimaryKeyRelatedField, drf_serializers.ModelField)):
+                getter = itemgetter(self._column(name))
+            else:
+                raise TypeError(f"{serializer_class.__name__}.{name} cannot be precompiled into a row extractor.")
+            self.getters.append((name, getter))
+
+    def _column(self, column):
+        if column not in self.columns:
+            self.columns.append(column)
+        return self.columns.index(column)
+
+    def extract(self, row):
+        """Output dict for one `values_list()` row, in serializer field order."""
+        return {name: get(row) for name, get in self.getters}
+
+    def serialize(self, queryset):
+        """List of output dicts for `queryset`, in one query and without model instances."""
+        getters = self.getters
+        return [{name: get(row) for name, get in getters} for row in queryset.values_list(*self.columns)]
+
+
+task_extractor = RowExtractor(TaskSerializer)
+task_list_extractor = RowExtractor(TaskListSerializer)
+project_extractor = RowExtractor(ProjectSerializer)
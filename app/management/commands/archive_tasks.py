@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app.archive import archive_completed_tasks
+
+
+class Command(BaseCommand):
+    help = 'Move completed task trees (and their dependencies) out of the live task table into the archive.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, required=True, metavar='DAYS',
+                            help='Archive trees whose main task was completed more than DAYS days ago.')
+        parser.add_argument('--batch-size', type=int, default=200,
+                            help='Number of task trees moved per transaction (default: 200).')
+
+    def handle(self, *args, **options):
+        if options['older_than'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--older-than must be >= 0 and --batch-size >= 1.')
+
+        cutoff = timezone.now() - timezone.timedelta(days=options['older_than'])
+        total_tasks = total_dependencies = 0
+        for tasks_archived, dependencies_archived in archive_completed_tasks(cutoff, batch_size=options['batch_size']):
+            total_tasks += tasks_archived
+            total_dependencies += dependencies_archived
+            if options['verbosity'] > 1:
+                self.stdout.write(f'Archived batch: {tasks_archived} tasks, {dependencies_archived} dependencies.')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {total_tasks} tasks and {total_dependencies} dependencies completed before {cutoff:%Y-%m-%d}.'
+        ))
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, models
+from django.utils import timezone
+
+from app.models import ChangeLog, Project, Task, TaskVersionConflict
+
+
+class Command(BaseCommand):
+    help = ('Run many workers assigning and completing the same tasks concurrently, once with full-row '
+            'task.save() and once with single-statement conditional updates (both version-checked, retried on '
+            'conflict), and report throughput and lost updates. Fixture rows are deleted afterwards.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8, help='Concurrent worker threads (default: 8).')
+        parser.add_argument('--tasks', type=int, default=50, help='Tasks in the shared project (default: 50).')
+        parser.add_argument('--think-ms', type=float, default=1.0,
+                            help='Simulated request handling time between reading and writing a task (default: 1).')
+
+    def handle(self, *args, **options):
+        for label, edit in (('task.save()', self.edit_with_save), ('conditional UPDATE', self.edit_conditionally)):
+            project, users = self.create_fixture(options['tasks'], options['workers'])
+            try:
+                elapsed, applied, retries = self.run_workers(project, users, edit, options['think_ms'] / 1000)
+                # Every applied edit bumps the version once, so a shortfall is edits silently overwritten
+                recorded = project.tasks.aggregate(total=models.Sum(models.F('version') - 1))['total']
+                self.stdout.write(
+                    f'  {label:<20} {applied / elapsed:8.1f} edits/s   {retries:5d} conflicts retried   '
+                    f'{applied - recorded:5d} of {applied} edits lost'
+                )
+            finally:
+                project_id = project.pk
+                project.delete()
+                ChangeLog.objects.filter(project_id=project_id).delete() # After the cascade, which writes delete tombstones
+                get_user_model().objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    def create_fixture(self, task_count, worker_count):
+        User = get_user_model()
+        users = [User.objects.create_user(username=f'contention-{worker}-{time.monotonic_ns()}') for worker in range(worker_count)]
+        project = Project.objects.create(title='Contention benchmark', start_date=timezone.now().date(), created_by=users[0])
+        Task.objects.bulk_create([Task(project=project, title=f'Task {i}', created_by=users[0]) for i in range(task_count)])
+        return project, users
+
+    def run_workers(self, project, users, edit, think):
+        """
+        Even workers assign every task to themselves, odd workers mark every task
+        completed, so each task sees interleaved edits to different fields.
+        """
+        task_ids = list(project.tasks.order_by('id').values_list('id', flat=True))
+        applied, retries = [0], [0]
+        lock = threading.Lock()
+
+        def worker(index):
+            try:
+                user = users[index]
+                changes = {'assigned_to': user} if index % 2 == 0 else {'is_completed': True, 'completion_date': timezone.now()}
+                offset = index * len(task_ids) // len(users) # Start workers on different tasks so they collide mid-run
+                for position in range(len(task_ids)):
+                    task_retries = edit(task_ids[(offset + position) % len(task_ids)], changes, think)
+                    with lock:
+                        applied[0] += 1
+                        retries[0] += task_retries
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(len(users))]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started, applied[0], retries[0]
+
+    def edit_with_save(self, task_id, changes, think):
+        """The PUT/PATCH path: read the row, change it in memory, save the whole row (signals included)."""
+        conflicts = 0
+        while True:
+            task = Task.objects.get(pk=task_id)
+            time.sleep(think)
+            for field, value in changes.items():
+                setattr(task, field, value)
+            try:
+                task.save()
+                return conflicts
+            except TaskVersionConflict:
+                conflicts += 1
+
+    def edit_conditionally(self, task_id, changes, think):
+        """The assign/mark_completed path, retrying on 409 the way a client would."""
+        conflicts = 0
+        while True:
+            task = Task.objects.get(pk=task_id)
+            time.sleep(think)
+            if task.conditional_update(task.version, **changes):
+                return conflicts
+            conflicts += 1
+
@@ -0,0 +1,70 @@
+import gzip
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from app.fastserializers import task_extractor, task_list_extractor
+from app.middleware import brotli
+from app.models import Project, Task
+from app.renderers import FastJSONRenderer, orjson
+from app.serializers import TaskSerializer, TaskListSerializer
+
+
+class Command(BaseCommand):
+    help = ('Benchmark serialize+render time and response size for large task lists: DRF serializers with '
+            'JSONRenderer against precompiled row extractors with FastJSONRenderer. Fixture rows are rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=10000, help='Number of tasks in the payload (default: 10000).')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per variant; the best is reported (default: 5).')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            queryset = self.create_fixture(options['tasks'])
+            self.stdout.write(f"{options['tasks']} tasks, best of {options['repeat']} runs "
+                              f"(orjson: {'yes' if orjson else 'no'}, brotli: {'yes' if brotli else 'no'})")
+            for label, serializer_class, extractor in (
+                ('TaskSerializer', TaskSerializer, task_extractor),
+                ('TaskListSerializer', TaskListSerializer, task_list_extractor),
+            ):
+                baseline = self.measure(lambda: JSONRenderer().render(serializer_class(queryset, many=True).data), options['repeat'])
+                fast = self.measure(lambda: FastJSONRenderer().render(extractor.serialize(queryset)), options['repeat'])
+                self.report(f'{label} + JSONRenderer', *baseline)
+                self.report(f'{label} extractor + FastJSONRenderer', *fast)
+                self.stdout.write(f'  speedup: {baseline[0] / fast[0]:.1f}x')
+            transaction.set_rollback(True)
+
+    def create_fixture(self, count):
+        User = get_user_model()
+        users = [User(username=f'bench-user-{i}', email=f'bench{i}@example.com', first_name='Bench', last_name=str(i)) for i in range(20)]
+        User.objects.bulk_create(users)
+        users = list(User.objects.filter(username__startswith='bench-user-'))
+        project = Project.objects.create(title='Benchmark project', start_date=timezone.now().date(), created_by=users[0])
+        now = timezone.now()
+        Task.objects.bulk_create([
+            Task(
+                project=project, title=f'Benchmark task {i}', description='Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 2,
+                duration_days=i % 10 + 1, created_by=users[i % len(users)], assigned_to=users[(i * 7) % len(users)] if i % 3 else None,
+                is_completed=i % 4 == 0, completion_date=now if i % 4 == 0 else None,
+            )
+            for i in range(count)
+        ], batch_size=1000)
+        return project.tasks.select_related('created_by', 'assigned_to')
+
+    def measure(self, render, repeat):
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = render()
+            best = min(best, time.perf_counter() - started)
+        return best, body
+
+    def report(self, label, seconds, body):
+        sizes = f'{len(body):,} B raw, {len(gzip.compress(body, compresslevel=6)):,} B gzip'
+        if brotli is not None:
+            sizes += f', {len(brotli.compress(body, quality=4)):,} B brotli'
+        self.stdout.write(f'  {label:<46} {seconds * 1000:8.1f} ms   {sizes}')
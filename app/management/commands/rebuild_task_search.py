@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from app.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index over task titles and descriptions.'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Task search uses SQLite FTS5 and is only available on the sqlite backend.')
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Task search index rebuilt.'))
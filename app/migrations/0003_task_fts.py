@@ -0,0 +1,58 @@
+from django.db import migrations
+
+
+# External-content FTS5 index over app_task, kept in sync by triggers so that
+# ORM saves, queryset .update() calls and raw SQL are all covered.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS app_task_fts USING fts5(
+        title, description,
+        content='app_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS app_task_fts_ai AFTER INSERT ON app_task BEGIN
+        INSERT INTO app_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS app_task_fts_ad AFTER DELETE ON app_task BEGIN
+        INSERT INTO app_task_fts(app_task_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS app_task_fts_au AFTER UPDATE OF title, description ON app_task BEGIN
+        INSERT INTO app_task_fts(app_task_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO app_task_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO app_task_fts(app_task_fts) VALUES ('rebuild')", # Index rows that existed before this migration
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS app_task_fts_au",
+    "DROP TRIGGER IF EXISTS app_task_fts_ad",
+    "DROP TRIGGER IF EXISTS app_task_fts_ai",
+    "DROP TABLE IF EXISTS app_task_fts",
+]
+
+
+def run_sql(statements):
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite': # FTS5 is SQLite-only
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return forwards
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_changelog'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sql(CREATE_SQL), run_sql(DROP_SQL)),
+    ]
@@ -0,0 +1,19 @@
+import importlib
+
+from django.db import migrations
+
+
+# SQLite applies AddField on app_task (0007) by rebuilding the table, which
+# drops the FTS sync triggers created in 0003. Re-create them and reindex.
+task_fts = importlib.import_module('app.migrations.0003_task_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_task_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(task_fts.run_sql(task_fts.CREATE_SQL), migrations.RunPython.noop),
+    ]
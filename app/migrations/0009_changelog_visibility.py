@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:33
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_visibility(apps, schema_editor):
+    """
+    Copy visibility onto existing entries from their (owning) task, one UPDATE
+    per kind. Entries for objects that are already gone are marked private, so
+    they never leak as tombstones.
+    """
+    ChangeLog = apps.get_model('app', 'ChangeLog')
+    Task = apps.get_model('app', 'Task')
+    TaskDependency = apps.get_model('app', 'TaskDependency')
+    owners = {
+        'task': Task.objects.filter(pk=OuterRef('object_id')),
+        'dependency': TaskDependency.objects.filter(pk=OuterRef('object_id')),
+    }
+    prefixes = {'task': '', 'dependency': 'task__'}
+    for kind, owner in owners.items():
+        prefix = prefixes[kind]
+        ChangeLog.objects.filter(kind=kind).update(
+            is_private=Coalesce(Subquery(owner.values(f'{prefix}is_private')[:1]), Value(True)),
+            created_by_id=Subquery(owner.values(f'{prefix}created_by_id')[:1]),
+            assigned_to_id=Subquery(owner.values(f'{prefix}assigned_to_id')[:1]),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0008_restore_task_fts_triggers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='changelog',
+            name='assigned_to_id',
+            field=models.PositiveBigIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='changelog',
+            name='created_by_id',
+            field=models.PositiveBigIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='changelog',
+            name='is_private',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_visibility, migrations.RunPython.noop),
+    ]
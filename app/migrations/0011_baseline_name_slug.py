@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_changelog_object_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='schedulebaseline',
+            name='name',
+            field=models.SlugField(db_index=False, max_length=100),
+        ),
+    ]
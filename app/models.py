@@ -1,4 +1,7 @@
-from django.db import models
+from array import array
+from datetime import date
+
+from django.db import models, transaction
 from django.conf import settings
 
 class Project(models.Model):
@@ -11,6 +14,11 @@ class Project(models.Model):
     def __str__(self):
         return self.title
 
+class TaskVersionConflict(Exception):
+    """A task row moved past the version being saved; the caller's copy is stale."""
+    client_message = 'Task was modified by someone else. Reload it and try again.' # Body of the API's 409 responses
+
+
 class Task(models.Model):
 
     project = models.ForeignKey(Project, related_name='tasks', on_delete=models.CASCADE)
@@ -23,15 +31,67 @@ class Task(models.Model):
     parent_task = models.ForeignKey('self', related_name='subtasks', on_delete=models.CASCADE, null=True, blank=True) # For subtasks
     is_completed = models.BooleanField(default=False)
     completion_date = models.DateTimeField(null=True, blank=True)
+    version = models.PositiveIntegerField(default=1) # Bumped on every write, for optimistic concurrency
+
+    PRIVACY_FIELDS = frozenset({'is_private', 'parent_task', 'parent_task_id'}) # Must go through save() and its signals
 
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
-
+        """
+        Saves of existing rows are conditional on `version` still matching the
+        database, and raise TaskVersionConflict instead of overwriting a newer edit.
+        """
         if self.parent_task and self.parent_task.is_private:
             self.is_private = True  # Inherit privacy from parent
-        super().save(*args, **kwargs)
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            return
+
+        self._expected_version = self.version
+        self.version += 1
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        try:
+            with transaction.atomic(): # Savepoint, so a conflict leaves the caller's transaction usable
+                super().save(*args, **kwargs)
+        except TaskVersionConflict:
+            self.version = self._expected_version
+            raise
+        finally:
+            self._expected_version = None
+
+    def _do_update(self, base_qs, using, pk_val, *args, **kwargs):
+        # Turns the UPDATE issued by save() into UPDATE ... WHERE id = ? AND version = ?
+        expected_version = getattr(self, '_expected_version', None)
+        if expected_version is None:
+            return super()._do_update(base_qs, using, pk_val, *args, **kwargs)
+        if super()._do_update(base_qs.filter(version=expected_version), using, pk_val, *args, **kwargs):
+            return True
+        if base_qs.filter(pk=pk_val).exists():
+            raise TaskVersionConflict(f"Task {pk_val} is no longer at version {expected_version}.")
+        return False # Row is gone; let Django fall back to an INSERT as usual
+
+    def conditional_update(self, expected_version, **changes):
+        """
+        Apply `changes` with a single UPDATE ... WHERE id = ? AND version = ?.
+        Returns False, leaving the instance untouched, if the row moved past
+        `expected_version` in the meantime. Skips save() and its signals, so it
+        refuses fields that feed privacy inheritance and records the change feed
+        entry itself. On success the instance reflects the new values.
+        """
+        if self.PRIVACY_FIELDS.intersection(changes):
+            raise ValueError("Privacy-related fields must be changed through save().")
+        with transaction.atomic():
+            updated = Task.objects.filter(pk=self.pk, version=expected_version).update(version=models.F('version') + 1, **changes)
+            if not updated:
+                return False
+            for field, value in changes.items():
+                setattr(self, field, value)
+            self.version = expected_version + 1
+            ChangeLog.record(ChangeLog.KIND_TASK, self.pk, ChangeLog.ACTION_UPDATE, self)
+        return True
 
     @property
     def is_main_task(self):
@@ -95,12 +155,236 @@ class TaskDependency(models.Model):
              raise ValidationError("Subtask cannot depend on a main task directly.")
 
 
+class ArchivedTask(models.Model):
+    """
+    Cold storage for completed task trees moved out of the Task table by
+    `manage.py archive_tasks`. Keeps the original primary key; tree and
+    dependency links are plain ids since the rows they point to may be archived too.
+    """
+    id = models.BigIntegerField(primary_key=True) # Original Task id
+    project = models.ForeignKey(Project, related_name='archived_tasks', on_delete=models.CASCADE)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    duration_days = models.PositiveIntegerField(default=1)
+    is_private = models.BooleanField(default=False)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='archived_created_tasks', on_delete=models.CASCADE)
+    assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='archived_assigned_tasks', on_delete=models.SET_NULL, null=True, blank=True)
+    parent_task_id = models.BigIntegerField(null=True, blank=True)
+    is_completed = models.BooleanField(default=True)
+    completion_date = models.DateTimeField(null=True, blank=True)
+    version = models.PositiveIntegerField(default=1)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.title
+
+    @property
+    def is_main_task(self):
+
+        return self.parent_task_id is None
+
+
+class ArchivedTaskDependency(models.Model):
+    """A TaskDependency row archived together with the task tree(s) it touched."""
+    id = models.BigIntegerField(primary_key=True) # Original TaskDependency id
+    task_id = models.BigIntegerField(db_index=True)
+    depends_on_task_id = models.BigIntegerField()
+    dependency_type = models.CharField(max_length=50, default='finish_to_start')
+    logical_condition = models.CharField(max_length=50, default='AND')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archived dependency: {self.task_id} depends on {self.depends_on_task_id}"
+
+
+class Holiday(models.Model):
+    """A non-working day for everyone (public holiday, company shutdown)."""
+    date = models.DateField(unique=True)
+    name = models.CharField(max_length=200, blank=True)
+
+    def __str__(self):
+        return f"{self.date}: {self.name}" if self.name else str(self.date)
+
+
+class UserTimeOff(models.Model):
+    """An inclusive range of days a single user is not working."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='time_off', on_delete=models.CASCADE)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    reason = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'end_date'], name='timeoff_user_end_idx')]
+
+    def __str__(self):
+        return f"{self.user}: {self.start_date} - {self.end_date}"
+
+    def clean(self):
+        if self.end_date < self.start_date:
+            raise ValidationError("Time off cannot end before it starts.")
+
+
+class ScheduledTask(models.Model):
+    """
+    Materialized output of the project scheduler, one row per scheduled task.
+    `end_date` is exclusive. Rows for a project are replaced wholesale on every reschedule.
+    """
+    task = models.OneToOneField(Task, related_name='scheduled', on_delete=models.CASCADE, primary_key=True)
+    project = models.ForeignKey(Project, related_name='scheduled_tasks', on_delete=models.CASCADE)
+    assigned_to = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='scheduled_tasks', on_delete=models.SET_NULL, null=True, blank=True)
+    start_date = models.DateField()
+    end_date = models.DateField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['assigned_to', 'start_date'], name='sched_user_start_idx'),
+            models.Index(fields=['project', 'start_date'], name='sched_project_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id}: {self.start_date} - {self.end_date}"
+
+    @classmethod
+    def overlapping(cls, date_from, date_to):
+        """Rows whose [start_date, end_date) overlaps the inclusive range [date_from, date_to]."""
+        return cls.objects.filter(start_date__lte=date_to, end_date__gt=date_from)
+
+    @classmethod
+    def replace_for_project(cls, project, entries):
+        """
+        Swap in a freshly computed schedule for `project` with one DELETE and one
+        bulk INSERT. `entries` are (task, start_date, end_date) tuples.
+        """
+        with transaction.atomic():
+            cls.objects.filter(project=project).delete()
+            cls.objects.bulk_create([
+                cls(task=task, project=project, assigned_to_id=task.assigned_to_id, start_date=start_date, end_date=end_date)
+                for task, start_date, end_date in entries
+            ])
+
+
+class ScheduleBaseline(models.Model):
+    """
+    A named snapshot of a project's schedule, for comparing plan against reality.
+    Rows are packed as signed 64-bit (task_id, start ordinal, end ordinal)
+    triples, 24 bytes per task.
+    """
+    project = models.ForeignKey(Project, related_name='schedule_baselines', on_delete=models.CASCADE)
+    name = models.SlugField(max_length=100, db_index=False) # Used in the diff URL; the unique constraint below indexes it
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='schedule_baselines', on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    data = models.BinaryField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['project', 'name'], name='unique_baseline_name_per_project')]
+
+    def __str__(self):
+        return f"{self.project}: {self.name}"
+
+    @staticmethod
+    def pack(rows):
+        """Pack (task_id, start_date, end_date) rows into bytes."""
+        packed = array('q')
+        for task_id, start_date, end_date in rows:
+            packed.extend((task_id, start_date.toordinal(), end_date.toordinal()))
+        return packed.tobytes()
+
+    def unpack(self):
+        """Return {task_id: (start_date, end_date)}."""
+        packed = array('q')
+        packed.frombytes(bytes(self.data))
+        return {
+            packed[i]: (date.fromordinal(packed[i + 1]), date.fromordinal(packed[i + 2]))
+            for i in range(0, len(packed), 3)
+        }
+
+
+class ChangeLog(models.Model):
+    """
+    Append-only feed of inserts, updates and deletes on tasks and dependencies.
+    `seq` is monotonic and doubles as the sync cursor handed to clients.
+    """
+    KIND_TASK = 'task'
+    KIND_DEPENDENCY = 'dependency'
+    KIND_CHOICES = [(KIND_TASK, 'Task'), (KIND_DEPENDENCY, 'Task dependency')]
+
+    ACTION_INSERT = 'insert'
+    ACTION_UPDATE = 'update'
+    ACTION_DELETE = 'delete'
+    ACTION_CHOICES = [(ACTION_INSERT, 'Insert'), (ACTION_UPDATE, 'Update'), (ACTION_DELETE, 'Delete')]
+
+    seq = models.BigAutoField(primary_key=True)
+    project_id = models.PositiveBigIntegerField() # Plain id, not a FK, so tombstones survive project deletion
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changed_at = models.DateTimeField(auto_now_add=True)
+    # Visibility of the (owning) task as of this change, so the feed only sends
+    # tombstones to users who could have seen the object
+    is_private = models.BooleanField(default=False)
+    created_by_id = models.PositiveBigIntegerField(null=True)
+    assigned_to_id = models.PositiveBigIntegerField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project_id', 'seq'], name='changelog_project_seq_idx'),
+            models.Index(fields=['project_id', 'kind', 'object_id'], name='changelog_object_idx'), # Tombstone lookups
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.action} {self.kind} {self.object_id}"
+
+    @classmethod
+    def record(cls, kind, object_id, action, task):
+        """Append an entry for `object_id`, snapshotting `task`'s project and visibility."""
+        return cls.objects.create(
+            project_id=task.project_id, kind=kind, object_id=object_id, action=action,
+            is_private=task.is_private, created_by_id=task.created_by_id, assigned_to_id=task.assigned_to_id,
+        )
+
+    @staticmethod
+    def visible_to(user):
+        """Q matching entries whose object was visible to `user` when the entry was written."""
+        return models.Q(is_private=False) | models.Q(created_by_id=user.pk) | models.Q(assigned_to_id=user.pk)
+
+
 from django.core.exceptions import ValidationError
 from django.dispatch import receiver
-from django.db.models.signals import pre_save
+from django.db.models.signals import pre_save, post_save, post_delete
 
 @receiver(pre_save, sender=Task)
 def enforce_privacy_inheritance(sender, instance, **kwargs):
     """Signal handler to enforce privacy inheritance for subtasks."""
     if instance.parent_task and instance.parent_task.is_private and not instance.is_private:
-        instance.is_private = True
\ No newline at end of file
+        instance.is_private = True
+
+
+@receiver(post_save, sender=Task)
+def record_task_change(sender, instance, created, raw=False, **kwargs):
+    """Append a change feed entry for every task insert/update."""
+    if raw:
+        return # Skip fixture loading
+    ChangeLog.record(ChangeLog.KIND_TASK, instance.pk, ChangeLog.ACTION_INSERT if created else ChangeLog.ACTION_UPDATE, instance)
+
+
+@receiver(post_delete, sender=Task)
+def record_task_delete(sender, instance, **kwargs):
+    """Leave a tombstone in the change feed when a task is deleted."""
+    ChangeLog.record(ChangeLog.KIND_TASK, instance.pk, ChangeLog.ACTION_DELETE, instance)
+
+
+@receiver(post_save, sender=TaskDependency)
+def record_dependency_change(sender, instance, created, raw=False, **kwargs):
+    """Append a change feed entry for every dependency insert/update."""
+    if raw:
+        return
+    ChangeLog.record(ChangeLog.KIND_DEPENDENCY, instance.pk, ChangeLog.ACTION_INSERT if created else ChangeLog.ACTION_UPDATE, instance.task)
+
+
+@receiver(post_delete, sender=TaskDependency)
+def record_dependency_delete(sender, instance, **kwargs):
+    """
+    Leave a tombstone when a dependency is deleted. Cascades delete dependencies
+    before their tasks, so the owning task is still readable here.
+    """
+    ChangeLog.record(ChangeLog.KIND_DEPENDENCY, instance.pk, ChangeLog.ACTION_DELETE, instance.task)
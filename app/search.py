@@ -0,0 +1,90 @@
+import html
+import re
+
+from django.core import checks
+from django.db import connection
+from django.db.utils import DatabaseError
+
+
+FTS_TABLE = 'app_task_fts'
+FTS_TRIGGERS = ('app_task_fts_ai', 'app_task_fts_ad', 'app_task_fts_au')
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+# Private-use code points marking matches in raw snippets, swapped for <mark> after escaping
+MATCH_START, MATCH_END = '\ue000', '\ue001'
+
+
+def build_match_query(raw_query):
+    """
+    Turn free text into a safe FTS5 MATCH expression: every word becomes a
+    quoted prefix term, and all terms must match. Returns '' if nothing is searchable.
+    """
+    terms = TERM_RE.findall(raw_query or '')
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_tasks(queryset, raw_query, limit=50):
+    """
+    Restrict `queryset` to tasks matching `raw_query`, ordered by BM25 rank
+    (title weighted above description). Each task gets `search_rank` and
+    `search_snippet` attributes; the snippet is raw text with matches
+    delimited by MATCH_START/MATCH_END, see render_snippet().
+    """
+    match = build_match_query(raw_query)
+    if not match:
+        return queryset.none()
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f'{FTS_TABLE}.rowid = app_task.id', f'{FTS_TABLE} MATCH %s'],
+        params=[match],
+        select={
+            'search_rank': f'bm25({FTS_TABLE}, 10.0, 1.0)',
+            'search_snippet': f"snippet({FTS_TABLE}, -1, '{MATCH_START}', '{MATCH_END}', '…', 12)",
+        },
+        order_by=['search_rank'],
+    )[:limit]
+
+
+def render_snippet(raw_snippet):
+    """HTML-escape a raw FTS snippet, then wrap its matches in <mark> tags."""
+    if raw_snippet is None:
+        return None
+    return html.escape(raw_snippet).replace(MATCH_START, '<mark>').replace(MATCH_END, '</mark>')
+
+
+def missing_triggers():
+    """
+    Names of FTS sync triggers absent from the database. SQLite drops them
+    whenever Django rebuilds app_task (e.g. for AddField), which silently
+    freezes the search index. Returns [] if the index does not exist yet.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT type, name FROM sqlite_master WHERE name = %s OR type = 'trigger'", [FTS_TABLE])
+        rows = cursor.fetchall()
+    if ('table', FTS_TABLE) not in rows:
+        return []
+    present = {name for kind, name in rows if kind == 'trigger'}
+    return [name for name in FTS_TRIGGERS if name not in present]
+
+
+@checks.register(checks.Tags.database)
+def check_search_triggers(app_configs=None, databases=None, **kwargs):
+    """System check (`manage.py check --database default`, also run by migrate)."""
+    if connection.vendor != 'sqlite' or 'default' not in (databases or ()):
+        return []
+    try:
+        missing = missing_triggers()
+    except DatabaseError:
+        return []
+    if not missing:
+        return []
+    return [checks.Warning(
+        f"Task search sync triggers are missing: {', '.join(missing)}. Search results will go stale.",
+        hint="A migration rebuilt app_task; add one that re-runs the CREATE_SQL of 0003_task_fts (see 0008).",
+        id='app.W001',
+    )]
+
+
+def rebuild_index():
+    """Rebuild the FTS index from the current contents of the task table."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
@@ -1,9 +1,10 @@
 from rest_framework import serializers
-from .models import Project, Task, TaskDependency
+from .models import Project, Task, TaskDependency, ScheduledTask, ScheduleBaseline, ArchivedTask
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User  # Or your custom user model
 from django.contrib.auth.password_validation import validate_password
 from django.core import exceptions
+from .search import render_snippet
 
 class RegistrationSerializer(serializers.Serializer):
     username = serializers.CharField(required=True)
@@ -75,11 +76,32 @@ class TaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Task
-        fields = ('id', 'project', 'title', 'description', 'duration_days', 'is_private', 'created_by', 'assigned_to', 'parent_task', 'is_completed', 'completion_date', 'is_main_task')
+        fields = ('id', 'project', 'title', 'description', 'duration_days', 'is_private', 'created_by', 'assigned_to', 'parent_task', 'is_completed', 'completion_date', 'is_main_task', 'version')
         read_only_fields = ('id', 'created_by', 'is_completed', 'completion_date', 'is_main_task') # Server-managed fields
+        extra_kwargs = {'version': {'required': False, 'min_value': 1}} # Version the client last saw, checked on update
+
+    def create(self, validated_data):
+        validated_data.pop('version', None) # New tasks always start at version 1
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        if 'version' in validated_data:
+            instance.version = validated_data.pop('version') # save() then only succeeds if the row is still there
+        return super().update(instance, validated_data)
     
 
 
+class ArchivedTaskSerializer(serializers.ModelSerializer): # Same shape as TaskSerializer, for ?include_archived=true
+    created_by = UserSerializer(read_only=True)
+    assigned_to = UserSerializer(read_only=True)
+    parent_task = serializers.IntegerField(source='parent_task_id', read_only=True)
+
+    class Meta:
+        model = ArchivedTask
+        fields = ('id', 'project', 'title', 'description', 'duration_days', 'is_private', 'created_by', 'assigned_to', 'parent_task', 'is_completed', 'completion_date', 'is_main_task', 'version', 'archived_at')
+        read_only_fields = fields
+
+
 class TaskDependencySerializer(serializers.ModelSerializer):
     task = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all())
     depends_on_task = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all())
@@ -95,9 +117,34 @@ class TaskListSerializer(serializers.ModelSerializer): # For listing tasks with
         model = Task
         fields = ('id', 'title', 'description', 'duration_days', 'is_private', 'assigned_to', 'is_completed', 'completion_date', 'is_main_task')
 
+class TaskSearchSerializer(TaskListSerializer): # Search hits with FTS rank and highlighted snippet
+    search_rank = serializers.FloatField(read_only=True)
+    search_snippet = serializers.SerializerMethodField() # Escaped HTML with <mark> around matches
+
+    class Meta(TaskListSerializer.Meta):
+        fields = TaskListSerializer.Meta.fields + ('search_rank', 'search_snippet')
+
+    def get_search_snippet(self, obj):
+        return render_snippet(obj.search_snippet)
+
+class ScheduledTaskSerializer(serializers.ModelSerializer): # Rows of the materialized schedule (agenda / gantt)
+    title = serializers.CharField(source='task.title', read_only=True)
+
+    class Meta:
+        model = ScheduledTask
+        fields = ('task', 'title', 'project', 'assigned_to', 'start_date', 'end_date')
+        read_only_fields = fields
+
+class ScheduleBaselineSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScheduleBaseline
+        fields = ('id', 'name', 'created_by', 'created_at')
+        read_only_fields = ('id', 'created_by', 'created_at')
+
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
     password = serializers.CharField(write_only=True)
     
 class TaskAssignmentSerializer(serializers.Serializer):
-    assigned_to_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), required=True) # Accept User ID for assignment
\ No newline at end of file
+    assigned_to_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), required=True) # Accept User ID for assignment
+    version = serializers.IntegerField(required=False, min_value=1) # Version the client last saw; defaults to the one just read
\ No newline at end of file
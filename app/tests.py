@@ -1,3 +1,422 @@
-from django.test import TestCase
+import datetime
+import threading
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection, models
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .archive import archive_completed_tasks
+from .fastserializers import task_extractor, task_list_extractor, project_extractor
+from .middleware import brotli, brotli_compress_padded
+from .models import Project, Task, TaskDependency, ScheduledTask, ArchivedTask, ArchivedTaskDependency, TaskVersionConflict
+from .renderers import FastJSONRenderer
+from .serializers import TaskSerializer, TaskListSerializer, ProjectSerializer
 
 # Create your tests here.
+
+
+class APITestBase(TestCase):
+    """Two users and a project owned by the first one."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user('owner', password='pass')
+        self.other = User.objects.create_user('other', password='pass')
+        self.project = Project.objects.create(title='Project', start_date=datetime.date(2025, 1, 6), created_by=self.owner)
+        self.client = self.client_for(self.owner)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def create_task(self, title='Task', **kwargs):
+        kwargs.setdefault('created_by', self.owner)
+        return Task.objects.create(project=self.project, title=title, **kwargs)
+
+
+class ChangeFeedTests(APITestBase):
+
+    def changes(self, client=None, since=0):
+        response = (client or self.client).get(f'/projects/{self.project.pk}/changes/', {'since': since})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_insert_is_returned_with_current_state(self):
+        task = self.create_task('First')
+        feed = self.changes()
+        self.assertEqual([t['id'] for t in feed['tasks']], [task.pk])
+        self.assertEqual(feed['tasks'][0]['title'], 'First')
+        self.assertEqual(feed['deleted'], {'tasks': [], 'dependencies': []})
+
+    def test_update_after_cursor_only_returns_changed_rows(self):
+        first, second = self.create_task('First'), self.create_task('Second')
+        cursor = self.changes()['cursor']
+        second.title = 'Second, renamed'
+        second.save()
+
+        feed = self.changes(since=cursor)
+        self.assertEqual([(t['id'], t['title']) for t in feed['tasks']], [(second.pk, 'Second, renamed')])
+        self.assertGreater(feed['cursor'], cursor)
+        self.assertEqual(self.changes(since=feed['cursor'])['tasks'], [])
+
+    def test_delete_leaves_tombstones_for_task_and_dependencies(self):
+        first, second = self.create_task('First'), self.create_task('Second')
+        dependency = TaskDependency.objects.create(task=second, depends_on_task=first)
+        cursor = self.changes()['cursor']
+        second_id, dependency_id = second.pk, dependency.pk
+        second.delete()
+
+        feed = self.changes(since=cursor)
+        self.assertEqual(feed['tasks'], [])
+        self.assertEqual(feed['deleted'], {'tasks': [second_id], 'dependencies': [dependency_id]})
+
+    def test_private_task_of_another_user_is_never_reported(self):
+        private = self.create_task('Private', is_private=True)
+        other_client = self.client_for(self.other)
+        feed = self.changes(other_client)
+        self.assertEqual(feed['tasks'], [])
+        self.assertEqual(feed['deleted']['tasks'], [])
+
+        private.title = 'Still private'
+        private.save()
+        private.delete()
+        self.assertEqual(self.changes(other_client, since=feed['cursor'])['deleted']['tasks'], [])
+
+    def test_task_turning_private_becomes_tombstone_for_those_who_saw_it(self):
+        task = self.create_task('Public')
+        other_client = self.client_for(self.other)
+        cursor = self.changes(other_client)['cursor']
+        task.is_private = True
+        task.save()
+
+        feed = self.changes(other_client, since=cursor)
+        self.assertEqual(feed['tasks'], [])
+        self.assertEqual(feed['deleted']['tasks'], [task.pk])
+        self.assertEqual([t['id'] for t in self.changes(since=cursor)['tasks']], [task.pk]) # Creator still sees it
+
+
+class TaskSearchTests(APITestBase):
+
+    def search(self, query, client=None):
+        response = (client or self.client).get('/tasks/search/', {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_saved_and_updated_tasks_are_searchable(self):
+        # Guards the FTS sync triggers, which SQLite drops whenever a migration rebuilds app_task
+        task = self.create_task('Quarterly report', description='numbers')
+        self.assertEqual([hit['id'] for hit in self.search('quart')], [task.pk])
+
+        task.title = 'Annual summary'
+        task.save()
+        self.assertEqual(self.search('quart'), [])
+        self.assertEqual([hit['id'] for hit in self.search('annu')], [task.pk])
+
+    def test_sync_triggers_exist(self):
+        from .search import check_search_triggers, missing_triggers
+        self.assertEqual(missing_triggers(), [])
+        self.assertEqual(check_search_triggers(databases=['default']), [])
+
+    def test_check_warns_when_a_trigger_is_dropped(self):
+        from django.db import connection
+        from .search import check_search_triggers
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER app_task_fts_au') # Rolled back with the test transaction
+        [warning] = check_search_triggers(databases=['default'])
+        self.assertEqual(warning.id, 'app.W001')
+
+    def test_snippet_is_html_escaped(self):
+        self.create_task('Alpha secret <script>x</script>')
+        [hit] = self.search('alpha')
+        self.assertEqual(hit['search_snippet'], '<mark>Alpha</mark> secret &lt;script&gt;x&lt;/script&gt;')
+
+    def test_results_honor_privacy(self):
+        self.create_task('Hidden report', is_private=True)
+        public = self.create_task('Shared report')
+        self.assertEqual([hit['id'] for hit in self.search('report', self.client_for(self.other))], [public.pk])
+
+
+class MaterializedScheduleTests(APITestBase):
+
+    def setUp(self):
+        super().setUp()
+        self.first = self.create_task('First', assigned_to=self.owner, duration_days=2)
+        self.second = self.create_task('Second', assigned_to=self.owner, duration_days=3)
+
+    def reschedule(self):
+        response = self.client.post(f'/projects/{self.project.pk}/reschedule/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_schedule_get_has_no_side_effects(self):
+        response = APIClient().get(f'/projects/{self.project.pk}/schedule/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(ScheduledTask.objects.exists())
+
+    def test_reschedule_requires_authentication(self):
+        response = APIClient().post(f'/projects/{self.project.pk}/reschedule/')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+        self.assertFalse(ScheduledTask.objects.exists())
+
+    def test_reschedule_materializes_rows_for_agenda_and_gantt(self):
+        schedule = self.reschedule()['schedule']
+        self.assertEqual(ScheduledTask.objects.count(), 2)
+        second = next(row for row in schedule if row['task_id'] == self.second.pk)
+
+        agenda = self.client.get('/users/me/agenda/', {'from': second['start_date'], 'to': second['start_date']}).json()
+        self.assertEqual([row['task'] for row in agenda], [self.second.pk])
+        gantt = self.client.get(f'/projects/{self.project.pk}/gantt/', {'from': second['start_date'], 'to': second['start_date']}).json()
+        self.assertEqual([row['task'] for row in gantt['schedule']], [self.second.pk])
+
+    def test_baseline_diff_reports_working_day_slips(self):
+        self.reschedule()
+        self.assertEqual(self.client.post(f'/projects/{self.project.pk}/baselines/', {'name': 'v1'}, format='json').status_code, status.HTTP_201_CREATED)
+        self.first.duration_days = 5
+        self.first.save()
+        self.reschedule()
+
+        diff = self.client.get(f'/projects/{self.project.pk}/baselines/v1/diff/').json()
+        slips = {row['task_id']: (row['start_slip_working_days'], row['end_slip_working_days']) for row in diff['changed']}
+        self.assertEqual(slips, {self.first.pk: (0, 3), self.second.pk: (3, 3)})
+
+    def test_baseline_name_must_fit_the_diff_url(self):
+        response = self.client.post(f'/projects/{self.project.pk}/baselines/', {'name': 'a/b'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', response.json())
+
+    def test_baseline_diff_hides_private_tasks(self):
+        self.first.is_private = True
+        self.first.save()
+        self.reschedule()
+        self.client.post(f'/projects/{self.project.pk}/baselines/', {'name': 'v1'}, format='json')
+        self.first.duration_days = 5
+        self.first.save()
+        self.reschedule()
+
+        diff = self.client_for(self.other).get(f'/projects/{self.project.pk}/baselines/v1/diff/').json()
+        self.assertEqual([row['task_id'] for row in diff['changed']], [self.second.pk])
+        self.assertEqual(diff['added'], [])
+        self.assertEqual(diff['removed'], [])
+
+
+class ArchiveTasksTests(APITestBase):
+
+    def setUp(self):
+        super().setUp()
+        self.long_ago = timezone.now() - datetime.timedelta(days=100)
+
+    def create_completed_tree(self, title, **kwargs):
+        main = self.create_task(title, is_completed=True, completion_date=self.long_ago, **kwargs)
+        subtask = self.create_task(f'{title} subtask', parent_task=main, is_completed=True, completion_date=self.long_ago, **kwargs)
+        return main, subtask
+
+    def archive(self):
+        call_command('archive_tasks', '--older-than', '30', stdout=StringIO())
+
+    def test_completed_tree_and_its_dependencies_are_moved(self):
+        main, subtask = self.create_completed_tree('Done')
+        dependency = TaskDependency.objects.create(task=subtask, depends_on_task=self.create_task('Live'))
+        self.archive()
+
+        self.assertFalse(Task.objects.filter(pk__in=[main.pk, subtask.pk]).exists())
+        self.assertEqual(set(ArchivedTask.objects.values_list('id', flat=True)), {main.pk, subtask.pk})
+        self.assertEqual(list(ArchivedTaskDependency.objects.values_list('id', flat=True)), [dependency.pk])
+
+    def test_tree_with_incomplete_subtask_is_skipped(self):
+        main, _ = self.create_completed_tree('Almost')
+        self.create_task('Open subtask', parent_task=main)
+        self.archive()
+
+        self.assertEqual(Task.objects.filter(parent_task=main).count(), 2)
+        self.assertFalse(ArchivedTask.objects.exists())
+
+    def test_tree_a_live_task_depends_on_is_kept(self):
+        main, _ = self.create_completed_tree('Prerequisite')
+        live = self.create_task('Live')
+        TaskDependency.objects.create(task=live, depends_on_task=main, logical_condition='OR')
+        self.archive()
+
+        self.assertTrue(Task.objects.filter(pk=main.pk).exists())
+        self.assertEqual(live.dependencies.count(), 1)
+        self.assertTrue(Task.are_dependencies_met(live))
+
+    def test_root_reopened_mid_run_is_kept(self):
+        first, _ = self.create_completed_tree('First')
+        second, _ = self.create_completed_tree('Second')
+        batches = archive_completed_tasks(timezone.now() - datetime.timedelta(days=30), batch_size=1)
+        self.assertEqual(next(batches), (2, 0))
+
+        second.is_completed = False # Reopened after the roots were listed
+        second.save()
+        self.assertEqual(next(batches), (0, 0))
+        self.assertTrue(Task.objects.filter(pk=second.pk).exists())
+
+    def test_recent_completions_are_kept(self):
+        main = self.create_task('Fresh', is_completed=True, completion_date=timezone.now())
+        self.archive()
+        self.assertTrue(Task.objects.filter(pk=main.pk).exists())
+
+    def test_include_archived_follows_visibility(self):
+        public, _ = self.create_completed_tree('Public')
+        private, _ = self.create_completed_tree('Private', is_private=True)
+        live = self.create_task('Live')
+        self.archive()
+        other_client = self.client_for(self.other)
+
+        self.assertEqual([t['id'] for t in other_client.get('/tasks/').json()], [live.pk])
+        listed = {t['id'] for t in other_client.get('/tasks/', {'include_archived': 'true'}).json()}
+        self.assertIn(public.pk, listed)
+        self.assertNotIn(private.pk, listed)
+        self.assertIn(private.pk, {t['id'] for t in self.client.get('/tasks/', {'include_archived': 'true'}).json()})
+
+
+class RowExtractorTests(APITestBase):
+
+    def setUp(self):
+        super().setUp()
+        main = self.create_task('Main', assigned_to=self.other, description='Long description')
+        self.create_task('Done subtask', parent_task=main, is_completed=True, completion_date=timezone.now())
+        self.create_task('Unassigned subtask', parent_task=main) # Null assignee
+        Project.objects.create(title='Second', description='More', start_date=datetime.date(2025, 2, 1), created_by=self.other)
+
+    def assertSameOutput(self, serializer_class, extractor, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        self.assertEqual(JSONRenderer().render(extractor.serialize(queryset)), expected)
+        self.assertEqual(FastJSONRenderer().render(extractor.serialize(queryset)), expected)
+
+    def test_task_extractor_matches_task_serializer(self):
+        self.assertSameOutput(TaskSerializer, task_extractor, Task.objects.order_by('id'))
+
+    def test_task_list_extractor_matches_task_list_serializer(self):
+        self.assertSameOutput(TaskListSerializer, task_list_extractor, Task.objects.order_by('id'))
+
+    def test_project_extractor_matches_project_serializer(self):
+        self.assertSameOutput(ProjectSerializer, project_extractor, Project.objects.order_by('id'))
+
+    def test_datetimes_follow_timezone_and_format_settings(self):
+        rest_framework = {**settings.REST_FRAMEWORK, 'DATETIME_FORMAT': '%Y-%m-%d %H:%M %Z', 'DATE_FORMAT': '%d.%m.%Y'}
+        with self.settings(TIME_ZONE='Asia/Kolkata', REST_FRAMEWORK=rest_framework):
+            self.assertSameOutput(TaskSerializer, task_extractor, Task.objects.order_by('id'))
+            self.assertSameOutput(ProjectSerializer, project_extractor, Project.objects.order_by('id'))
+            [completion_date] = [t['completion_date'] for t in task_list_extractor.serialize(Task.objects.all()) if t['completion_date']]
+            self.assertTrue(completion_date.endswith('IST'))
+
+
+class CompressionMiddlewareTests(TestCase):
+
+    @skipUnless(brotli, 'brotli is not installed')
+    def test_brotli_output_is_padded_and_decodable(self):
+        data = b'{"title": "Task"}' * 500
+        plain = len(brotli.compress(data, quality=4))
+        sizes = set()
+        for _ in range(20):
+            compressed = brotli_compress_padded(data, 4)
+            self.assertEqual(brotli.decompress(compressed), data)
+            sizes.add(len(compressed) - plain)
+        self.assertTrue(all(size > 0 for size in sizes))
+        self.assertGreater(len(sizes), 1) # Padding length varies between responses
+
+
+class TaskVersionTests(APITestBase):
+
+    def setUp(self):
+        super().setUp()
+        self.task = self.create_task('Versioned')
+
+    def test_stale_version_on_assign_returns_409_and_keeps_row(self):
+        response = self.client.patch(f'/tasks/{self.task.pk}/assign/', {'assigned_to_id': self.other.pk, 'version': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['version'], 2)
+
+        response = self.client.patch(f'/tasks/{self.task.pk}/assign/', {'assigned_to_id': self.owner.pk, 'version': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.assigned_to_id, self.task.version), (self.other.pk, 2))
+
+    def test_stale_version_on_mark_completed_returns_409_and_keeps_row(self):
+        Task.objects.filter(pk=self.task.pk).update(version=5)
+        response = self.client.post(f'/tasks/{self.task.pk}/mark_completed/', {'version': 4}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.is_completed, self.task.version), (False, 5))
+
+        response = self.client.post(f'/tasks/{self.task.pk}/mark_completed/', {'version': 5}, format='json')
+        self.assertEqual(response.json(), {'status': 'Task marked as completed.', 'version': 6})
+
+    def test_stale_version_on_patch_returns_409_and_keeps_row(self):
+        self.assertEqual(self.client.patch(f'/tasks/{self.task.pk}/', {'title': 'Renamed', 'version': 1}, format='json').status_code, status.HTTP_200_OK)
+        response = self.client.patch(f'/tasks/{self.task.pk}/', {'title': 'Stale rename', 'version': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.title, self.task.version), ('Renamed', 2))
+
+    def test_saving_a_stale_instance_raises_instead_of_reverting(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        self.assertTrue(self.task.conditional_update(1, assigned_to=self.other))
+        stale.title = 'Stale'
+        with self.assertRaises(TaskVersionConflict):
+            stale.save()
+        self.assertEqual(stale.version, 1)
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.assigned_to_id, self.task.title, self.task.version), (self.other.pk, 'Versioned', 2))
+
+    def test_conditional_update_rejects_privacy_fields(self):
+        for field in Task.PRIVACY_FIELDS:
+            with self.assertRaises(ValueError):
+                self.task.conditional_update(1, **{field: None})
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.version, 1)
+
+
+class ConcurrentTaskEditTests(TransactionTestCase):
+    """Many workers editing one project through both write paths must not lose a single edit."""
+    WORKERS = 6
+    EDITS_PER_WORKER = 20
+
+    def test_no_lost_updates(self):
+        users = [User.objects.create_user(f'worker-{i}') for i in range(self.WORKERS)]
+        project = Project.objects.create(title='Shared', start_date=datetime.date(2025, 1, 6), created_by=users[0])
+        task_ids = [Task.objects.create(project=project, title=f'Task {i}', created_by=users[0]).pk for i in range(4)]
+        applied, errors = [], []
+        lock = threading.Lock()
+
+        def worker(index):
+            try:
+                for edit in range(self.EDITS_PER_WORKER):
+                    task_id = task_ids[(index + edit) % len(task_ids)]
+                    while True:
+                        task = Task.objects.get(pk=task_id)
+                        if index % 2: # Half the workers go through save(), half through conditional_update()
+                            task.title = f'Edited by {index}'
+                            try:
+                                task.save()
+                                break
+                            except TaskVersionConflict:
+                                continue
+                        if task.conditional_update(task.version, assigned_to=users[index]):
+                            break
+                    with lock:
+                        applied.append(task_id)
+            except Exception as error: # Surface worker failures in the main thread
+                errors.append(error)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(self.WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(applied), self.WORKERS * self.EDITS_PER_WORKER)
+        recorded = Task.objects.filter(pk__in=task_ids).aggregate(total=models.Sum(models.F('version') - 1))['total']
+        self.assertEqual(recorded, len(applied)) # Every applied edit bumped the version exactly once
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ProjectViewSet, TaskViewSet, TaskDependencyViewSet, AssignedTaskListView,LoginView,LogoutView,RegistrationView
+from .views import ProjectViewSet, TaskViewSet, TaskDependencyViewSet, AssignedTaskListView, AgendaView,LoginView,LogoutView,RegistrationView
 
 router = DefaultRouter()
 router.register(r'projects', ProjectViewSet, basename='project')
@@ -21,6 +21,7 @@ urlpatterns = [
     path('projects/<int:project_pk>/', include(project_router.urls)), # Nested tasks under projects
     path('tasks/<int:task_pk>/', include(task_router.urls)), # Nested dependencies and subtasks under tasks
     path('users/me/assigned-tasks/', AssignedTaskListView.as_view(), name='assigned-tasks'), # List assigned tasks
+    path('users/me/agenda/', AgendaView.as_view(), name='agenda'), # Scheduled tasks in a date range
     path('auth/login/', LoginView.as_view(), name='login-api'), # Login API endpoint
     path('auth/logout/', LogoutView.as_view(), name='logout-api'), 
     path('auth/register/', RegistrationView.as_view(), name='register-api'),
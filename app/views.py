@@ -1,15 +1,44 @@
 from rest_framework import viewsets, permissions, generics, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Project, Task, TaskDependency # Make sure your models are imported
-from .serializers import ProjectSerializer, TaskSerializer, TaskDependencySerializer, TaskListSerializer, LoginSerializer , RegistrationSerializer,TaskAssignmentSerializer# Import LoginSerializer
+from .models import Project, Task, TaskDependency, ChangeLog, ScheduledTask, ScheduleBaseline, ArchivedTask, TaskVersionConflict # Make sure your models are imported
+from .serializers import ProjectSerializer, TaskSerializer, TaskDependencySerializer, TaskListSerializer, LoginSerializer , RegistrationSerializer,TaskAssignmentSerializer, TaskSearchSerializer, ScheduledTaskSerializer, ScheduleBaselineSerializer, ArchivedTaskSerializer# Import LoginSerializer
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework.views import APIView # Import APIView
 from django.contrib.auth import authenticate, login, logout # Import authentication functions
 from django.db import models
 from django.core.exceptions import ValidationError
 from collections import defaultdict
+from .search import search_tasks
+from .workcalendar import WorkingCalendar
+from .fastserializers import task_extractor, task_list_extractor, project_extractor
+
+
+def parse_date_range(request, default_days=7):
+    """
+    Read an inclusive `?from=&to=` (ISO dates) range from the query string.
+    Defaults to today through `default_days` later. Returns (date_from, date_to, error_response).
+    """
+    raw_from, raw_to = request.query_params.get('from'), request.query_params.get('to')
+    try:
+        date_from = parse_date(raw_from) if raw_from else timezone.now().date()
+        date_to = parse_date(raw_to) if raw_to else date_from and date_from + timezone.timedelta(days=default_days)
+    except ValueError:
+        date_from = date_to = None
+    if date_from is None or date_to is None:
+        return None, None, Response({'error': "'from' and 'to' must be valid YYYY-MM-DD dates."}, status=status.HTTP_400_BAD_REQUEST)
+    if date_to < date_from:
+        return None, None, Response({'error': "'to' must not be before 'from'."}, status=status.HTTP_400_BAD_REQUEST)
+    return date_from, date_to, None
+
+
+def working_day_slip(calendar, planned, actual):
+    """Signed number of working days `actual` lies after `planned` (negative if earlier)."""
+    if actual >= planned:
+        return calendar.working_days_between(planned, actual)
+    return -calendar.working_days_between(actual, planned)
 
 class RegistrationView(generics.GenericAPIView):
     serializer_class = RegistrationSerializer
@@ -72,36 +101,126 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_authenticated:
             return Project.objects.all().only('id', 'title', 'description') # Optimized for public view
         return Project.objects.all()
+
+    def list(self, request, *args, **kwargs):
+        """
+        List projects through the precompiled row extractor (one query, no model instances).
+        """
+        return Response(project_extractor.serialize(self.filter_queryset(self.get_queryset())))
     
     @action(detail=True, methods=['get'])
     def schedule(self, request, pk=None):
         """
         Action to generate and return an optimal schedule for the project.
+        Read-only; use /reschedule/ to store it for agenda/gantt queries.
         """
         project = self.get_object()
         schedule_data = self.generate_project_schedule(project)
         return Response(schedule_data, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
+    def reschedule(self, request, pk=None):
+        """
+        Action to generate the project schedule and persist it into the
+        materialized schedule table read by agenda, gantt and baselines.
+        """
+        project = self.get_object()
+        schedule_data = self.generate_project_schedule(project, persist=True)
+        return Response(schedule_data, status=status.HTTP_200_OK)
+
+    CHANGE_FEED_TASK_FIELDS = ('id', 'title', 'description', 'duration_days', 'is_private', 'assigned_to', 'parent_task', 'is_completed', 'completion_date')
+    CHANGE_FEED_DEPENDENCY_FIELDS = ('id', 'task', 'depends_on_task', 'dependency_type', 'logical_condition')
+    CHANGE_FEED_MAX_LIMIT = 1000
+
+    @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def changes(self, request, pk=None):
+        """
+        Delta-sync feed: rows changed after `?since=<cursor>` (default 0).
+        Each changed object is returned once in its current state, or as a
+        tombstone id if it was deleted or is no longer visible to the user.
+        Tombstones are only sent for objects the user could see at some point,
+        so private tasks of others never surface, not even as bare ids.
+        Pass the returned `cursor` as the next `since`; `has_more` means the
+        batch was capped by `?limit=` and the client should fetch again.
+        """
+        project = self.get_object()
+        try:
+            since = int(request.query_params.get('since', 0))
+            limit = min(int(request.query_params.get('limit', self.CHANGE_FEED_MAX_LIMIT)), self.CHANGE_FEED_MAX_LIMIT)
+        except ValueError:
+            return Response({'error': "'since' and 'limit' must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        if since < 0 or limit < 1:
+            return Response({'error': "'since' must be >= 0 and 'limit' >= 1."}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries = list(
+            ChangeLog.objects.filter(project_id=project.pk, seq__gt=since)
+            .order_by('seq')
+            .values_list('seq', 'kind', 'object_id')[:limit + 1]
+        )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        cursor = entries[-1][0] if entries else since
+
+        # Collapse the log to one entry per object; only the current state matters
+        changed_ids = {ChangeLog.KIND_TASK: set(), ChangeLog.KIND_DEPENDENCY: set()}
+        for _, kind, object_id in entries:
+            changed_ids[kind].add(object_id)
+
+        visible = models.Q(is_private=False) | models.Q(created_by=request.user) | models.Q(assigned_to=request.user)
+        tasks = list(
+            project.tasks.filter(visible, pk__in=changed_ids[ChangeLog.KIND_TASK])
+            .values(*self.CHANGE_FEED_TASK_FIELDS)
+        )
+        dependencies = list(
+            TaskDependency.objects.filter(pk__in=changed_ids[ChangeLog.KIND_DEPENDENCY], task__in=project.tasks.filter(visible))
+            .values(*self.CHANGE_FEED_DEPENDENCY_FIELDS)
+        )
 
-    def generate_project_schedule(self, project):
+        missing_ids = {
+            ChangeLog.KIND_TASK: changed_ids[ChangeLog.KIND_TASK] - {t['id'] for t in tasks},
+            ChangeLog.KIND_DEPENDENCY: changed_ids[ChangeLog.KIND_DEPENDENCY] - {d['id'] for d in dependencies},
+        }
+        deleted = {}
+        for kind, key in ((ChangeLog.KIND_TASK, 'tasks'), (ChangeLog.KIND_DEPENDENCY, 'dependencies')):
+            deleted[key] = sorted(set(
+                ChangeLog.objects.filter(ChangeLog.visible_to(request.user), project_id=project.pk, kind=kind, object_id__in=missing_ids[kind], seq__lte=cursor)
+                .values_list('object_id', flat=True)
+            )) if missing_ids[kind] else []
+
+        return Response({
+            'cursor': cursor,
+            'has_more': has_more,
+            'tasks': tasks,
+            'dependencies': dependencies,
+            'deleted': deleted,
+        }, status=status.HTTP_200_OK)
+
+
+    def generate_project_schedule(self, project, persist=False):
         """
         Generates a project schedule considering task durations, dependencies,
         user constraints (sequential/parallel within project, project switching).
+        Durations are in working days, per the assignee's WorkingCalendar
+        (weekends, holidays and their time off). With `persist`, the result
+        replaces the project's rows in the materialized schedule table.
         """
-        tasks = list(project.task_set.all()) # Convert QuerySet to list for manipulation
+        tasks = list(project.tasks.select_related('assigned_to').prefetch_related('dependencies__depends_on_task')) # Convert QuerySet to list for manipulation
         if not tasks:
             return {"detail": "No tasks in this project to schedule."}
 
+        today = timezone.now().date()
+        calendars = WorkingCalendar.for_users({task.assigned_to for task in tasks}, today) # Compiled once per user, O(1) lookups below
+
         scheduled_tasks = {} # {task_id: {'start_date': ..., 'end_date': ...}}
         task_start_dates = {} # Track calculated start dates for dependencies
         task_end_dates = {}   # Track calculated end dates for dependencies
-        user_last_end_times_in_project = defaultdict(lambda: timezone.datetime.min.replace(tzinfo=timezone.utc)) # Last task end time per user *in this project*
+        user_last_end_dates_in_project = {} # Last task end date per user *in this project*
         user_project_workload = defaultdict(set) # Track projects users are currently working on
 
 
         # 1. Initial Tasks (no dependencies met initially considered ready to start)
-        initial_tasks = [task for task in tasks if task.dependencies_met] # Initially consider all as potentially initial if dependencies are managed dynamically later
-        tasks_to_schedule = [task for task in tasks if not task.dependencies_met] # Tasks yet to be scheduled explicitly based on dependency check
+        initial_tasks = [task for task in tasks if Task.are_dependencies_met(task)] # Initially consider all as potentially initial if dependencies are managed dynamically later
+        tasks_to_schedule = [task for task in tasks if not Task.are_dependencies_met(task)] # Tasks yet to be scheduled explicitly based on dependency check
 
         tasks_scheduled_count = 0
         tasks_to_process = initial_tasks[:] # Start with initial tasks
@@ -113,12 +232,12 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 continue
 
             user = task_to_schedule.assigned_to
-            earliest_start_date = timezone.now().date() # Default start is project start or today - refine if needed
+            earliest_start_date = today # Default start is project start or today - refine if needed
 
             # Consider sequential task for same user within project:
-            last_end_time_user_project = user_last_end_times_in_project[user]
-            if last_end_time_user_project > timezone.datetime.min.replace(tzinfo=timezone.utc):
-                 earliest_start_date = max(earliest_start_date, last_end_time_user_project.date())
+            last_end_date_user_project = user_last_end_dates_in_project.get(user)
+            if last_end_date_user_project:
+                 earliest_start_date = max(earliest_start_date, last_end_date_user_project)
 
 
             # Project Switching Constraint:
@@ -127,7 +246,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 if project not in other_projects: # Trying to schedule task in a *new* project
                     currently_working_projects_tasks_incomplete = False
                     for other_proj in other_projects:
-                        other_proj_incomplete_tasks_for_user = other_proj.task_set.filter(assigned_to=user, is_completed=False)
+                        other_proj_incomplete_tasks_for_user = other_proj.tasks.filter(assigned_to=user, is_completed=False)
                         if other_proj_incomplete_tasks_for_user.exists():
                             currently_working_projects_tasks_incomplete = True
                             break # User still has incomplete tasks in other projects
@@ -137,8 +256,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
                         continue # To next task in queue
 
 
-            start_date = earliest_start_date
-            end_date = start_date + timezone.timedelta(days=task_to_schedule.duration_days)
+            calendar = calendars[user]
+            start_date = calendar.next_working_day(earliest_start_date)
+            end_date = calendar.add_working_days(start_date, task_to_schedule.duration_days) # Exclusive: day after the last worked day
 
             scheduled_tasks[task_to_schedule.id] = {
                 'task_id': task_to_schedule.id,
@@ -148,7 +268,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             }
             task_start_dates[task_to_schedule.id] = start_date
             task_end_dates[task_to_schedule.id] = end_date
-            user_last_end_times_in_project[user] = max(user_last_end_times_in_project[user], end_date) # Update last end time for user in this project
+            user_last_end_dates_in_project[user] = max(user_last_end_dates_in_project.get(user, end_date), end_date) # Update last end date for user in this project
             user_project_workload[user].add(project) # Track project for user workload management
 
 
@@ -157,7 +277,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             # Check for newly schedulable tasks based on dependencies after scheduling current task
             next_schedulable_tasks = []
             for task in tasks_to_schedule:
-                 if task.dependencies_met: # Re-evaluate dependencies
+                 if Task.are_dependencies_met(task): # Re-evaluate dependencies
                     if task.id not in scheduled_tasks: # And not yet scheduled
                         next_schedulable_tasks.append(task)
 
@@ -165,8 +285,108 @@ class ProjectViewSet(viewsets.ModelViewSet):
             tasks_to_schedule = [t for t in tasks_to_schedule if t not in next_schedulable_tasks] # Remove added tasks
 
 
+        if persist:
+            ScheduledTask.replace_for_project(project, [ # Materialize for agenda/gantt range queries
+                (task, task_start_dates[task.id], task_end_dates[task.id]) for task in tasks if task.id in scheduled_tasks
+            ])
+
         return {"schedule": list(scheduled_tasks.values()), "tasks_scheduled_count": tasks_scheduled_count, "total_tasks": len(tasks)}
 
+    @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def gantt(self, request, pk=None):
+        """
+        Scheduled tasks of the project overlapping `?from=&to=`, read from the
+        materialized schedule (POST /reschedule/ to refresh it).
+        """
+        project = self.get_object()
+        date_from, date_to, error = parse_date_range(request, default_days=30)
+        if error:
+            return error
+        visible = models.Q(task__is_private=False) | models.Q(task__created_by=request.user) | models.Q(task__assigned_to=request.user)
+        rows = (
+            ScheduledTask.overlapping(date_from, date_to)
+            .filter(visible, project=project)
+            .select_related('task')
+            .order_by('start_date', 'task_id')
+        )
+        return Response({
+            'from': date_from,
+            'to': date_to,
+            'schedule': ScheduledTaskSerializer(rows, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get', 'post'], permission_classes=[permissions.IsAuthenticated])
+    def baselines(self, request, pk=None):
+        """
+        GET lists the project's baselines. POST `{"name": <slug>}` snapshots the
+        current materialized schedule under that name.
+        """
+        project = self.get_object()
+        if request.method == 'GET':
+            serializer = ScheduleBaselineSerializer(project.schedule_baselines.order_by('-created_at'), many=True)
+            return Response(serializer.data)
+
+        serializer = ScheduleBaselineSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        name = serializer.validated_data['name']
+        if project.schedule_baselines.filter(name=name).exists():
+            return Response({'error': f"Baseline '{name}' already exists for this project."}, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = project.scheduled_tasks.order_by('task_id').values_list('task_id', 'start_date', 'end_date')
+        serializer.save(project=project, created_by=request.user, data=ScheduleBaseline.pack(rows))
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'], url_path=r'baselines/(?P<name>[-\w]+)/diff', permission_classes=[permissions.IsAuthenticated])
+    def baseline_diff(self, request, pk=None, name=None):
+        """
+        Compare a baseline with the current materialized schedule. Only tasks
+        visible to the user and whose dates moved are listed; slips are in
+        working days of the task's current assignee.
+        """
+        project = self.get_object()
+        baseline = get_object_or_404(ScheduleBaseline, project=project, name=name)
+        visible = models.Q(is_private=False) | models.Q(created_by=request.user) | models.Q(assigned_to=request.user)
+        visible_ids = set(project.tasks.filter(visible).values_list('id', flat=True))
+        visible_ids.update(project.archived_tasks.filter(visible).values_list('id', flat=True)) # Removed because archived
+
+        planned = {task_id: dates for task_id, dates in baseline.unpack().items() if task_id in visible_ids}
+        current = {
+            row.task_id: row
+            for row in project.scheduled_tasks.filter(task_id__in=visible_ids).select_related('assigned_to')
+        }
+
+        moved = [
+            task_id for task_id in sorted(planned.keys() & current.keys())
+            if planned[task_id] != (current[task_id].start_date, current[task_id].end_date)
+        ]
+        calendars = {}
+        if moved:
+            origin = min(min(planned[task_id][0], current[task_id].start_date) for task_id in moved)
+            calendars = WorkingCalendar.for_users({current[task_id].assigned_to for task_id in moved}, origin)
+
+        changes = []
+        for task_id in moved:
+            (planned_start, planned_end), row = planned[task_id], current[task_id]
+            calendar = calendars[row.assigned_to]
+            changes.append({
+                'task_id': task_id,
+                'baseline_start': planned_start,
+                'baseline_end': planned_end,
+                'current_start': row.start_date,
+                'current_end': row.end_date,
+                'start_slip_working_days': working_day_slip(calendar, planned_start, row.start_date),
+                'end_slip_working_days': working_day_slip(calendar, planned_end, row.end_date),
+            })
+
+        return Response({
+            'baseline': baseline.name,
+            'created_at': baseline.created_at,
+            'changed': changes,
+            'added': sorted(current.keys() - planned.keys()),
+            'removed': sorted(planned.keys() - current.keys()),
+        }, status=status.HTTP_200_OK)
+
 
 
 class TaskViewSet(viewsets.ModelViewSet):
@@ -179,6 +399,7 @@ class TaskViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         List tasks for a specific project or all tasks accessible to the user.
+        Only live tasks; archived ones are added by list() on request.
         """
         project_id = self.kwargs.get('project_pk') # project_pk from URL conf (nested routes)
         if project_id:
@@ -190,6 +411,29 @@ class TaskViewSet(viewsets.ModelViewSet):
             models.Q(is_private=False) | models.Q(created_by=self.request.user) | models.Q(assigned_to=self.request.user)
         )
 
+    def get_archived_queryset(self):
+        """
+        Archived tasks under the same project and visibility rules as get_queryset().
+        """
+        archived = ArchivedTask.objects.filter(
+            models.Q(is_private=False) | models.Q(created_by=self.request.user) | models.Q(assigned_to=self.request.user)
+        )
+        project_id = self.kwargs.get('project_pk')
+        if project_id:
+            archived = archived.filter(project_id=project_id)
+        return archived
+
+    def list(self, request, *args, **kwargs):
+        """
+        List live tasks; `?include_archived=true` appends archived tasks as well.
+        Live rows go through the precompiled row extractor rather than TaskSerializer.
+        """
+        data = task_extractor.serialize(self.filter_queryset(self.get_queryset()))
+        if request.query_params.get('include_archived', '').lower() in ('true', '1'):
+            archived = self.get_archived_queryset().select_related('created_by', 'assigned_to')
+            data += ArchivedTaskSerializer(archived, many=True).data
+        return Response(data)
+
     
     def perform_create(self, serializer):
         project_id = self.kwargs.get('project_pk') # project_pk from URL conf (nested projects case)
@@ -211,31 +455,61 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         serializer.save(created_by=self.request.user, project=project, parent_task=parent_task) # Set creator, project, and parent_task
 
+    def update(self, request, *args, **kwargs):
+        """
+        PUT/PATCH a task. Pass the `version` you last saw to have the write
+        rejected with 409 if someone else changed the task in the meantime.
+        """
+        try:
+            return super().update(request, *args, **kwargs)
+        except TaskVersionConflict:
+            return Response({'error': TaskVersionConflict.client_message}, status=status.HTTP_409_CONFLICT)
+
     @action(detail=True, methods=['post'])
     def mark_completed(self, request, pk=None):
         """
         Action to mark a task as completed.
+        Optional `version` in the body guards against overwriting a newer edit (409).
         """
         task = self.get_object()
-        if task.created_by == request.user or task.assigned_to == request.user:
+        if request.user.pk in (task.created_by_id, task.assigned_to_id):
+            try:
+                expected_version = int(request.data.get('version', task.version))
+            except (TypeError, ValueError):
+                return Response({'error': "'version' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
             if task.is_main_task:
                 subtasks_incomplete = task.subtasks.filter(is_completed=False).exists()
                 if subtasks_incomplete:
                     return Response({'error': 'Cannot mark main task as complete until all subtasks are completed.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            task.is_completed = True
-            task.completion_date = timezone.now()
-            task.save()
+            if not task.conditional_update(expected_version, is_completed=True, completion_date=timezone.now()):
+                return Response({'error': TaskVersionConflict.client_message}, status=status.HTTP_409_CONFLICT)
 
-            if not task.parent_task and not task.is_completed and not task.subtasks.filter(is_completed=False).exists(): # Auto-complete main task
-                  task.is_completed = True
-                  task.completion_date = timezone.now()
-                  task.save()
-
-            return Response({'status': 'Task marked as completed.'})
+            return Response({'status': 'Task marked as completed.', 'version': task.version})
         else:
             return Response({'error': 'Only creator or assignee can mark task as completed.'}, status=status.HTTP_403_FORBIDDEN)
 
+    SEARCH_MAX_LIMIT = 200
+
+    @action(detail=False, methods=['get'])
+    def search(self, request, project_pk=None, task_pk=None):
+        """
+        Full-text search over task titles and descriptions (`?q=`), BM25-ranked
+        with prefix matching. Only tasks visible via get_queryset() are returned.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', 50)), self.SEARCH_MAX_LIMIT)
+        except ValueError:
+            return Response({'error': "'limit' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = search_tasks(self.get_queryset().select_related('assigned_to'), query, limit=max(limit, 1))
+        serializer = TaskSearchSerializer(results, many=True)
+        return Response(serializer.data)
+
     @action(detail=True, methods=['get'])
     def subtasks(self, request, pk=None):
         """
@@ -260,9 +534,11 @@ class TaskViewSet(viewsets.ModelViewSet):
             # Authorization Check (Optional but recommended):
             # For now, let's just assume creator or project members can assign.
             # You might need more specific permission logic based on requirements.
-            if task.created_by == request.user or task.project.created_by == request.user : # Example: Creator or project creator can assign
-                task.assigned_to = assigned_to_user # Assign the task
-                task.save()
+            if request.user.pk in (task.created_by_id, task.project.created_by_id): # Example: Creator or project creator can assign
+                expected_version = serializer.validated_data.get('version', task.version)
+                if not task.conditional_update(expected_version, assigned_to=assigned_to_user): # Assign the task
+                    return Response({'error': TaskVersionConflict.client_message}, status=status.HTTP_409_CONFLICT)
+                ScheduledTask.objects.filter(task=task).update(assigned_to=assigned_to_user) # Keep the materialized schedule's assignee in step
                 task_serializer = TaskSerializer(task) # Serialize the updated task (using full TaskSerializer to return all task details)
                 return Response(task_serializer.data, status=status.HTTP_200_OK)
             else:
@@ -307,4 +583,33 @@ class AssignedTaskListView(generics.ListAPIView):
         """
         Return tasks assigned to the current user.
         """
-        return Task.objects.filter(assigned_to=self.request.user)
\ No newline at end of file
+        return Task.objects.filter(assigned_to=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        return Response(task_list_extractor.serialize(self.get_queryset()))
+
+
+class AgendaView(generics.ListAPIView):
+    """
+    API View listing the logged-in user's scheduled tasks overlapping `?from=&to=`.
+    """
+    serializer_class = ScheduledTaskSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def list(self, request, *args, **kwargs):
+        date_from, date_to, error = parse_date_range(request)
+        if error:
+            return error
+        self.date_range = (date_from, date_to)
+        return super().list(request, *args, **kwargs)
+
+    def get_queryset(self):
+        """
+        Return the user's rows from the materialized schedule in the requested range.
+        """
+        return (
+            ScheduledTask.overlapping(*self.date_range)
+            .filter(assigned_to=self.request.user)
+            .select_related('task')
+            .order_by('start_date', 'task_id')
+        )
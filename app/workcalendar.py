@@ -0,0 +1,100 @@
+from collections import defaultdict
+from datetime import timedelta
+from itertools import accumulate
+
+from django.conf import settings
+
+from .models import Holiday, UserTimeOff
+
+
+DEFAULT_WORK_WEEK = (0, 1, 2, 3, 4) # Monday..Friday, as date.weekday() values
+DEFAULT_HORIZON_DAYS = 366
+
+
+class WorkingCalendar:
+    """
+    A working-day calendar compiled into lookup tables over a date window, so
+    that "add N working days" and "working days between" are O(1).
+
+    `cumulative[i]` is the number of working days in [origin, origin + i), and
+    `working_offsets[k]` is the offset from origin of the k-th working day.
+    Looking outside the window recompiles it with a doubled horizon.
+    """
+
+    def __init__(self, origin, non_working_dates=(), work_week=None, horizon_days=DEFAULT_HORIZON_DAYS):
+        self.origin = origin
+        self.non_working_dates = frozenset(non_working_dates)
+        self.work_week = frozenset(work_week if work_week is not None else getattr(settings, 'WORK_WEEK', DEFAULT_WORK_WEEK))
+        if not self.work_week:
+            raise ValueError("A working calendar needs at least one working weekday.")
+        self._compile(horizon_days)
+
+    def _compile(self, horizon_days):
+        origin_weekday = self.origin.weekday()
+        is_working = [
+            (origin_weekday + i) % 7 in self.work_week and (self.origin + timedelta(days=i)) not in self.non_working_dates
+            for i in range(horizon_days)
+        ]
+        self.horizon_days = horizon_days
+        self.cumulative = [0] + list(accumulate(is_working))
+        self.working_offsets = [i for i, working in enumerate(is_working) if working]
+
+    def _offset(self, day):
+        offset = (day - self.origin).days
+        if offset < 0:
+            raise ValueError(f"{day} is before the calendar origin {self.origin}.")
+        while offset > self.horizon_days:
+            self._compile(self.horizon_days * 2)
+        return offset
+
+    def is_working_day(self, day):
+        return self.working_days_between(day, day + timedelta(days=1)) == 1
+
+    def next_working_day(self, day):
+        """`day` itself if it is a working day, otherwise the first one after it."""
+        return self.add_working_days(day, 1) - timedelta(days=1)
+
+    def add_working_days(self, start, days):
+        """
+        Exclusive end date of a `days`-long stretch of work beginning on the
+        first working day on or after `start`: the day after the last worked day.
+        """
+        if days <= 0:
+            return start
+        start_offset = self._offset(start)
+        index = self.cumulative[start_offset] + days - 1 # Position of the last worked day
+        while index >= len(self.working_offsets):
+            self._compile(self.horizon_days * 2)
+        return self.origin + timedelta(days=self.working_offsets[index] + 1)
+
+    def working_days_between(self, start, end):
+        """Number of working days in [start, end)."""
+        if end <= start:
+            return 0
+        end_offset, start_offset = self._offset(end), self._offset(start) # May recompile, so resolve before indexing
+        return self.cumulative[end_offset] - self.cumulative[start_offset]
+
+    @classmethod
+    def for_users(cls, users, origin, horizon_days=DEFAULT_HORIZON_DAYS):
+        """
+        Build one calendar per user (plus `None` for unassigned work) with two
+        queries in total: global holidays and everyone's overlapping time off.
+        """
+        holidays = set(Holiday.objects.filter(date__gte=origin).values_list('date', flat=True))
+
+        user_ids = {user.pk for user in users if user is not None}
+        time_off = defaultdict(set)
+        for user_id, start_date, end_date in UserTimeOff.objects.filter(
+            user_id__in=user_ids, end_date__gte=origin
+        ).values_list('user_id', 'start_date', 'end_date'):
+            day = max(start_date, origin)
+            while day <= end_date:
+                time_off[user_id].add(day)
+                day += timedelta(days=1)
+
+        calendars = {None: cls(origin, holidays, horizon_days=horizon_days)}
+        for user in users:
+            if user is not None and user not in calendars:
+                calendars[user] = cls(origin, holidays | time_off[user.pk], horizon_days=horizon_days)
+        return calendars
+
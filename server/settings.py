@@ -43,6 +43,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'app.middleware.CompressionMiddleware', # gzip/brotli by Accept-Encoding, see RESPONSE_COMPRESSION_MIN_SIZE
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -79,6 +80,12 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE', # Take the write lock at BEGIN so concurrent writers wait instead of failing
+        },
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3', # File, not shared-cache memory, so threaded tests get real SQLite locking
+        },
     }
 }
 
@@ -124,4 +131,22 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-CSRF_COOKIE_SECURE = False  # For local development over HTTP. SET TO TRUE IN PRODUCTION (HTTPS)!
\ No newline at end of file
+CSRF_COOKIE_SECURE = False  # For local development over HTTP. SET TO TRUE IN PRODUCTION (HTTPS)!
+
+
+# Django REST framework
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'app.renderers.FastJSONRenderer', # orjson when installed, stock JSONRenderer otherwise
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Responses smaller than this many bytes are not worth compressing
+
+RESPONSE_COMPRESSION_MIN_SIZE = 1024
+
+# Working calendar used by the scheduler (date.weekday() values, Monday=0)
+
+WORK_WEEK = [0, 1, 2, 3, 4]